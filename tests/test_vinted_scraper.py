@@ -0,0 +1,165 @@
+import json
+import time
+
+import httpx
+import pytest
+import urllib3
+
+import vinted_scraper
+from vinted_scraper import calculate_average_price
+
+
+@pytest.mark.parametrize(
+    "prices, expected",
+    [
+        ([], None),
+        ([12.0], 12.0),
+        ([10.0, 100.0], 55.0),
+        ([10.0, 20.0, 90.0], 40.0),
+    ],
+)
+def test_calculate_average_price_small_inputs(prices, expected):
+    assert calculate_average_price(prices) == expected
+
+
+def test_calculate_average_price_trims_outliers():
+    prices = [10.0] * 9 + [999.0]
+    assert calculate_average_price(prices) == 10.0
+
+
+class FakeDriver:
+    """Stands in for a WebDriver; a dead one fails like a killed chromedriver."""
+
+    def __init__(self, dead):
+        self.dead = dead
+        self.quit_called = False
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, value):
+        if self.dead:
+            raise urllib3.exceptions.MaxRetryError(None, "/session", "connection refused")
+        return object()
+
+    def execute_script(self, script, *args):
+        if script is vinted_scraper.EXTRACT_PRICES_JS:
+            return [10.0, 20.0]
+        return 5
+
+    def quit(self):
+        self.quit_called = True
+        if self.dead:
+            raise urllib3.exceptions.MaxRetryError(None, "/session", "connection refused")
+
+
+def test_scrape_pages_replaces_dead_browser(monkeypatch, tmp_path):
+    started = []
+    monkeypatch.setattr(vinted_scraper, "PROFILE_DIR", tmp_path)
+
+    def fake_setup_driver(headless=True, profile_dir=None):
+        driver = FakeDriver(dead=not started)
+        started.append(driver)
+        return driver
+
+    monkeypatch.setattr(vinted_scraper, "setup_driver", fake_setup_driver)
+    try:
+        assert vinted_scraper.scrape_pages(["https://www.vinted.co.uk/catalog"]) == [10.0, 20.0]
+        dead, fresh = started
+        assert dead.quit_called
+        assert dead not in vinted_scraper._drivers
+        assert fresh in vinted_scraper._drivers
+    finally:
+        vinted_scraper.quit_drivers()
+
+
+def test_fetch_api_prices_refreshes_expired_cookies(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        if request.url.path == "/":
+            return httpx.Response(200, headers={"set-cookie": "_vinted_fr_session=fresh; Path=/"})
+        if "fresh" not in request.headers.get("cookie", ""):
+            return httpx.Response(401)
+        return httpx.Response(200, json={"items": [{"price": {"amount": "12.50"}}]})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    client.cookies.set("_vinted_fr_session", "expired", domain="www.vinted.co.uk")
+    monkeypatch.setattr(vinted_scraper, "_http_client", client)
+
+    assert vinted_scraper.fetch_api_prices("nike") == [12.5] * vinted_scraper.SEARCH_PAGES
+    assert seen.count("/") == 1
+
+
+@pytest.mark.skipif(vinted_scraper.fcntl is None, reason="needs fcntl")
+def test_lock_profile_skips_profiles_in_use(monkeypatch, tmp_path):
+    monkeypatch.setattr(vinted_scraper, "PROFILE_DIR", tmp_path)
+
+    first_dir, first_lock = vinted_scraper.lock_profile()
+    second_dir, second_lock = vinted_scraper.lock_profile()
+    assert (first_dir, second_dir) == (tmp_path / "worker-0", tmp_path / "worker-1")
+
+    first_lock.close()
+    reused_dir, reused_lock = vinted_scraper.lock_profile()
+    assert reused_dir == tmp_path / "worker-0"
+    second_lock.close()
+    reused_lock.close()
+
+
+@pytest.mark.parametrize("body", [[1, 2], {"items": None}, {"items": "oops"}])
+def test_fetch_api_prices_rejects_malformed_responses(monkeypatch, body):
+    def handler(request):
+        return httpx.Response(200, json=body, headers={"set-cookie": "anon_id=1; Path=/"})
+
+    monkeypatch.setattr(vinted_scraper, "_http_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    assert vinted_scraper.fetch_api_prices("nike") == []
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        "not a dict",
+        {"prices": [10.0]},
+        {"ts": "yesterday", "prices": [10.0]},
+        {"ts": True, "prices": [10.0]},
+        {"ts": 1e20, "prices": [10.0]},
+        {"ts": 0, "prices": [10.0]},
+        {"ts": "now"},
+        {"ts": "now", "prices": []},
+        {"ts": "now", "prices": "10.0"},
+        {"ts": "now", "prices": [True]},
+        {"ts": "now", "prices": [10.0, "11"]},
+    ],
+)
+def test_load_cached_prices_drops_malformed_entries(monkeypatch, tmp_path, entry):
+    cache_file = tmp_path / "queries.json"
+    monkeypatch.setattr(vinted_scraper, "QUERY_CACHE_FILE", cache_file)
+    if isinstance(entry, dict) and entry.get("ts") == "now":
+        entry["ts"] = time.time()
+    cache_file.write_text(json.dumps({"key": entry}))
+
+    assert vinted_scraper.load_cached_prices("key") is None
+
+
+def test_cached_prices_round_trip(monkeypatch, tmp_path):
+    monkeypatch.setattr(vinted_scraper, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(vinted_scraper, "QUERY_CACHE_FILE", tmp_path / "queries.json")
+    key = vinted_scraper.construct_cache_key("Nike", "Air Force 1", "Good")
+
+    vinted_scraper.save_cached_prices(key, [10.0, 12.5])
+    assert vinted_scraper.load_cached_prices(key) == [10.0, 12.5]
+    assert vinted_scraper.load_cached_prices(vinted_scraper.construct_cache_key("nike", "air force 1", "Good")) == [10.0, 12.5]
+
+
+def test_construct_search_url_encodes_special_characters():
+    url = vinted_scraper.construct_search_url("Nike", "Air & Force/1 é", "Good")
+    assert url == (
+        "https://www.vinted.co.uk/catalog"
+        "?search_text=Nike+Air+%26+Force%2F1+%C3%A9+Good&page=1&per_page=20"
+    )
+
+
+def test_construct_search_url_paging_and_order():
+    url = vinted_scraper.construct_search_url("Zara", "coat", "Good", page=2, max_items=40, order="price_low_to_high")
+    assert url.endswith("?search_text=Zara+coat+Good&page=2&per_page=40&order=price_low_to_high")
@@ -1,6 +1,6 @@
 """
 Vinted UK Web Scraper
-Scrapes product listings from Vinted UK to calculate average prices
+Scrapes product listings from Vinted UK to calculate typical prices
 for items matching user-specified brand, description, and condition.
 """
 
@@ -10,20 +10,135 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-import re
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+import httpx
+import numpy as np
+import atexit
+import json
+import math
+import os
+import shutil
+import threading
 import time
+import urllib3
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, browsers use temporary profiles
+    fcntl = None
+
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+VINTED_HOME_URL = "https://www.vinted.co.uk/"
+VINTED_API_URL = "https://www.vinted.co.uk/api/v2/catalog/items"
+CACHE_DIR = Path.home() / ".cache" / "vinted_scraper"
+PROFILE_DIR = CACHE_DIR / "profile"
+MAX_PROFILES = 16
+QUERY_CACHE_FILE = CACHE_DIR / "queries.json"
+QUERY_CACHE_TTL = 3600  # seconds
+# Ads, analytics, images and fonts, blocked in the browser's network stack
+BLOCKED_URLS = [
+    "*googletagmanager*",
+    "*google-analytics*",
+    "*doubleclick*",
+    "*hotjar*",
+    "*segment.io*",
+    "*facebook.net*",
+    "*.png",
+    "*.jpg",
+    "*.webp",
+    "*.woff*",
+]
+SEARCH_PAGES = 3
+ITEMS_PER_PAGE = 20
+# One browser per results page, but each is a whole Chrome, so cap them
+BROWSER_WORKERS = min(SEARCH_PAGES, 4)
+# HTTP workers only hold a request each, so they can go higher
+API_WORKERS = min(SEARCH_PAGES, 8)
+# API statuses that mean "not allowed from a plain HTTP client"; Vinted's
+# bot protection answers with these, so the browser is tried instead
+API_REFUSED_STATUSES = (401, 403)
+
+# Candidate CSS selectors for price elements, in order of preference
+PRICE_SELECTORS = [
+    "[class*='price']",
+    "[data-testid*='price']",
+    ".new-item-box__price",
+    ".feed-grid__item [class*='price']",
+    "[class*='Price']",
+    "[class*='item-price']",
+]
+COMBINED_PRICE_SELECTOR = ",".join(PRICE_SELECTORS)
+
+# Raised when a browser has crashed or its chromedriver process is gone;
+# Selenium does not wrap urllib3's errors when the driver stops answering
+BROWSER_ERRORS = (WebDriverException, urllib3.exceptions.HTTPError)
+
+# Runs inside the page with PRICE_SELECTORS as arguments[0]: returns the
+# prices (first number of each text, as floats) of the first selector that
+# yields any, and only then falls back to the slow XPath over every element
+# whose own text contains "£"
+EXTRACT_PRICES_JS = r"""
+const selectors = arguments[0];
+const priceRe = /\d+(?:\.\d+)?/;
+const parsePrices = texts => {
+    const prices = [];
+    for (const text of texts) {
+        const match = priceRe.exec(text);
+        if (match) prices.push(parseFloat(match[0]));
+    }
+    return prices;
+};
+for (const selector of selectors) {
+    // Lazy-loaded price spans can match before their text is filled in,
+    // so only stop at a selector that actually yielded prices
+    const prices = parsePrices(Array.from(document.querySelectorAll(selector), e => e.textContent));
+    if (prices.length) return prices;
+}
+const texts = [];
+const found = document.evaluate("//*[contains(text(), '£')]", document, null,
+                                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < found.snapshotLength; i++) {
+    const text = found.snapshotItem(i).textContent;
+    if (text.includes("£")) texts.push(text);
+}
+return parsePrices(texts);
+"""
+
+# One browser per worker thread, kept alive between scrapes
+_thread_local = threading.local()
+_drivers = []
+_drivers_lock = threading.Lock()
+_profile_locks = {}
+_browser_pool = ThreadPoolExecutor(max_workers=BROWSER_WORKERS)
+
+# One pooled HTTP/2 client for every API call, so the TLS handshake
+# and the Vinted session cookies are reused across pages and searches
+_http_client = httpx.Client(
+    http2=True,
+    headers={"User-Agent": USER_AGENT},
+    timeout=15,
+    limits=httpx.Limits(max_keepalive_connections=10),
+)
+_api_pool = ThreadPoolExecutor(max_workers=API_WORKERS)
+atexit.register(_http_client.close)
 
 
 def get_user_input():
     """
     Prompt user for product information.
-    Returns tuple of (brand, description, condition).
+    Returns tuple of (brand, description, condition), or None if the
+    brand was left empty to quit.
     """
     print("=" * 60)
     print("Vinted UK Price Scraper")
     print("=" * 60)
-    brand = input("Enter brand (e.g., Nike, Zara): ").strip()
+    brand = input("Enter brand (e.g., Nike, Zara), or press Enter to quit: ").strip()
+    if not brand:
+        return None
     description = input("Enter a detailed description of the product (e.g., White Air Force 1 sneakers): ").strip()
 
     # Product condition menu
@@ -53,29 +168,137 @@ def get_user_input():
     return brand, description, condition
 
 
-def construct_search_url(brand, description, condition):
+def construct_search_terms(brand, description, condition):
+    """
+    Join brand, description and condition into a single search string.
+    """
+    return f"{brand} {description} {condition}".strip()
+
+
+def construct_search_url(brand, description, condition, page=1, max_items=ITEMS_PER_PAGE, order=None):
     """
     Construct the Vinted UK search URL from brand and description.
-    Replaces spaces with + for URL encoding.
+    Query parameters are URL-encoded, so "&", "/" and accents are safe.
+    
+    Args:
+        page: Results page number (1-based)
+        max_items: Listings per page; fewer listings load faster
+        order: Optional Vinted sort order (e.g. "price_low_to_high");
+            Vinted's default relevance order is used if None
     """
-    # Format intputs: replace spaces with "+"
-    search_terms = f"{brand} {description} {condition}".strip()
-    search_text = search_terms.replace(" ", "+")
+    search_terms = construct_search_terms(brand, description, condition)
+    params = {"search_text": search_terms, "page": page, "per_page": max_items}
+    if order:
+        params["order"] = order
     
     # Construct URL
     base_url = "https://www.vinted.co.uk/catalog"
-    url = f"{base_url}?search_text={search_text}"
+    url = f"{base_url}?{urlencode(params)}"
     
     return url
 
 
-def setup_driver(headless=True):
+def construct_cache_key(brand, description, condition):
+    """
+    Build the query cache key; brand and description are case-insensitive.
+    """
+    return f"{brand.lower()}|{description.lower()}|{condition}"
+
+
+def is_number(value):
+    """
+    Check for a finite int or float (JSON booleans don't count).
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def is_fresh_cache_entry(entry, now):
+    """
+    Check that a saved search result is well-formed and not expired.
+    
+    Args:
+        entry: Value loaded from the query cache file
+        now: Current time.time()
+    
+    Returns:
+        True if entry has a timestamp within the last QUERY_CACHE_TTL
+        seconds (not in the future) and a non-empty list of prices
+    """
+    if not isinstance(entry, dict):
+        return False
+    ts, prices = entry.get("ts"), entry.get("prices")
+    return (
+        is_number(ts)
+        and 0 <= now - ts < QUERY_CACHE_TTL
+        and isinstance(prices, list)
+        and len(prices) > 0
+        and all(is_number(price) for price in prices)
+    )
+
+
+def load_query_cache():
+    """
+    Load saved search results, dropping entries older than QUERY_CACHE_TTL.
+    
+    Returns:
+        Dict of cache key -> {"ts": timestamp, "prices": [floats]}
+    """
+    try:
+        cache = json.loads(QUERY_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(cache, dict):
+        return {}
+    
+    # Malformed entries are dropped just like an unreadable file
+    now = time.time()
+    return {key: entry for key, entry in cache.items() if is_fresh_cache_entry(entry, now)}
+
+
+def load_cached_prices(cache_key):
+    """
+    Load prices saved by a recent identical search.
+    
+    Args:
+        cache_key: Key from construct_cache_key
+    
+    Returns:
+        List of float prices, or None if there is no fresh entry
+    """
+    entry = load_query_cache().get(cache_key)
+    return entry["prices"] if entry else None
+
+
+def save_cached_prices(cache_key, prices):
+    """
+    Save the prices found for a search so repeat searches skip scraping.
+    
+    Args:
+        cache_key: Key from construct_cache_key
+        prices: List or NumPy array of float prices
+    """
+    cache = load_query_cache()
+    cache[cache_key] = {"ts": time.time(), "prices": [float(price) for price in prices]}
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        QUERY_CACHE_FILE.write_text(json.dumps(cache))
+    except OSError:
+        pass
+
+
+def setup_driver(headless=True, profile_dir=None):
     """
     Setup and configure Chrome driver with Selenium.
-    Uses webdriver_manager to automatically handle driver installation.
+    Uses the chromedriver from CHROMEDRIVER_PATH or the PATH if there is
+    one, otherwise Selenium Manager resolves it from its local cache.
     
     Args:
         headless: If True, runs browser in headless mode (no GUI)
+        profile_dir: Chrome user data directory, kept between runs so
+            cookies and the HTTP cache stay warm. Two browsers cannot
+            share one directory at the same time (see lock_profile).
+            If None, Chrome uses a fresh temporary profile.
     
     Returns:
         Configured WebDriver instance
@@ -84,18 +307,151 @@ def setup_driver(headless=True):
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless")
+    if profile_dir is not None:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        chrome_options.add_argument("--profile-directory=Default")
+    chrome_options.add_argument("--disk-cache-size=104857600")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
     
-    # Use webdriver_manager to handle driver setup
-    service = Service(ChromeDriverManager().install())
+    # Skip images and other resources the scraper never looks at
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-translate")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    
+    # Only one origin is scraped, so run a single renderer without site
+    # isolation and skip the background throttling/hang heuristics
+    for flag in [
+        "--disable-features=TranslateUI,BlinkGenPropertyTrees,IsolateOrigins,site-per-process",
+        "--renderer-process-limit=1",
+        "--disable-hang-monitor",
+        "--disable-backgrounding-occluded-windows",
+        "--disable-renderer-backgrounding",
+        "--disable-ipc-flooding-protection",
+        "--no-zygote",
+    ]:
+        chrome_options.add_argument(flag)
+    
+    # Return from driver.get() on DOMContentLoaded; the explicit waits in
+    # scrape_vinted_prices decide when the prices are actually there
+    chrome_options.page_load_strategy = "eager"
+    
+    # Let Selenium Manager find a driver when none is configured
+    driver_path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+    service = Service(executable_path=driver_path)
     driver = webdriver.Chrome(service=service, options=chrome_options)
     
+    # Block requests that only slow the page down before they are sent
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    
     return driver
 
 
+def fetch_api_page(search_terms, page):
+    """
+    Fetch one page of listing prices from Vinted's catalog JSON API.
+    
+    Args:
+        search_terms: Plain search string (see construct_search_terms)
+        page: Results page number (1-based)
+    
+    Returns:
+        List of price values (floats), or None if the API refused
+        the request (see API_REFUSED_STATUSES)
+    
+    Raises:
+        httpx.HTTPStatusError: For any other error status, e.g. 429
+        ValueError: If the response body is not the expected JSON object
+    """
+    response = _http_client.get(
+        VINTED_API_URL,
+        params={"search_text": search_terms, "per_page": ITEMS_PER_PAGE, "page": page},
+    )
+    if response.status_code in API_REFUSED_STATUSES:
+        return None
+    response.raise_for_status()
+    
+    # A 200 with an unexpected body (not an object, "items": null) is
+    # handled like unparseable JSON
+    data = response.json()
+    items = data.get("items", []) if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise ValueError("Unexpected catalog API response")
+    
+    prices = []
+    for item in items:
+        try:
+            prices.append(float(item["price"]["amount"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return prices
+
+
+def fetch_api_prices(search_terms):
+    """
+    Fetch listing prices straight from Vinted's catalog JSON API.
+    Much faster than rendering the search page in a browser.
+    Result pages are requested concurrently over the shared client.
+    
+    Args:
+        search_terms: Plain search string (see construct_search_terms)
+    
+    Returns:
+        List of price values (floats), or None if the API refused
+        the request (401/403) and the browser scraper should be used instead.
+        Other error statuses, such as 429 rate limiting, are reported and
+        give an empty list: the browser would hit the same limit.
+    """
+    try:
+        seeded = False
+        while True:
+            # Visit the homepage first so Vinted issues the session cookies
+            # the API expects (_vinted_fr_session, anon_id)
+            if not _http_client.cookies:
+                _http_client.get(VINTED_HOME_URL)
+                seeded = True
+            pages = list(_api_pool.map(
+                lambda page: fetch_api_page(search_terms, page),
+                range(1, SEARCH_PAGES + 1),
+            ))
+            if None not in pages or seeded:
+                break
+            # The session cookie may have expired during a long session;
+            # retry once with fresh cookies before using the browser
+            _http_client.cookies.clear()
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 429:
+            print("Vinted is limiting requests right now. Please wait a few minutes and try again.")
+        else:
+            print(f"Vinted returned an error (HTTP {e.response.status_code}). Please try again later.")
+        return []
+    except (httpx.HTTPError, ValueError):
+        print("Check your internet connection and try again.")
+        return []
+    
+    if None in pages:
+        # Start from fresh cookies on the next search too
+        _http_client.cookies.clear()
+        return None
+    
+    prices = [price for page_prices in pages for price in page_prices]
+    
+    print(f"Extracted {len(prices)} product prices")
+    
+    return prices
+
+
 def scrape_vinted_prices(driver, url):
     """
     Navigate to Vinted URL, wait for content to load, and extract prices.
@@ -106,206 +462,319 @@ def scrape_vinted_prices(driver, url):
     
     Returns:
         List of price values (floats)
+    
+    Prints one line per page, since several pages load at once.
     """
-    print(f"\nLoading page: {url}")
     driver.get(url)
     
-    
     # Wait up to 15 seconds for product prices to appear
     # Search for elements that contain "price" or  "£"
+    # Errors from a dead browser are left to the caller, which replaces it
+    wait = WebDriverWait(driver, 15)
+    
+    # One wait covers every candidate selector, so a page without
+    # prices gives up after 15 seconds instead of 15 per selector
     try:
-
-        print("\nCalculating a price for your product...")
-        wait = WebDriverWait(driver, 15)
-        
-        
-        price_selectors = [
-            (By.CSS_SELECTOR, "[class*='price']"),
-            (By.CSS_SELECTOR, "[data-testid*='price']"),
-            (By.XPATH, "//*[contains(text(), '£')]"),
-            (By.CSS_SELECTOR, ".new-item-box__price"),
-        ]
-        
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, COMBINED_PRICE_SELECTOR)))
+        price_element_found = True
+    except TimeoutException:
         price_element_found = False
-        for by, selector in price_selectors:
-            try:
-                wait.until(EC.presence_of_element_located((by, selector)))
-                price_element_found = True
-                break
-            except:
-                continue
-        
-        if not price_element_found:
-            # Wait for any content that might contain products
-            print("Loading...")
+    
+    if price_element_found:
+        # Let the rest of the listings render, returning as soon as
+        # enough prices are on the page rather than sleeping. Counting
+        # in the page avoids sending every element handle back each poll
+        try:
+            WebDriverWait(driver, 5).until(
+                lambda d: d.execute_script(
+                    "return document.querySelectorAll(arguments[0]).length;",
+                    COMBINED_PRICE_SELECTOR,
+                ) >= 5
+            )
+        except TimeoutException:
+            pass
+    else:
+        # Wait for any content that might contain products
+        try:
             wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(3)  # Give extra time for JS to render
-        
-        # Additional wait to ensure all content is loaded
-        time.sleep(2)
-        
-    except Exception as e:
-        print(f"Check your internet connection and try again.")
+        except TimeoutException:
+            print(f"Could not load {url}. Check your internet connection and try again.")
+            return []
+    
+    # Extract prices from the page in a single WebDriver round trip
+    try:
+        prices = driver.execute_script(EXTRACT_PRICES_JS, PRICE_SELECTORS)
+    except JavascriptException as e:
+        print(f"Could not read prices from {url}. Error: {e}")
         return []
     
-    # Extract prices from the page
-    prices = []
+    print(f"Loaded {url}: {len(prices)} prices")
+    
+    return prices
+
+
+def lock_profile():
+    """
+    Claim the first worker-N profile that no other browser is using,
+    including browsers started by other copies of the scraper.
     
-    price_patterns = [
-        "[class*='price']",
-        "[data-testid*='price']",
-        ".new-item-box__price",
-        ".feed-grid__item [class*='price']",
-        "[class*='Price']",
-        "[class*='item-price']",
-    ]
+    Returns:
+        Tuple of (profile_dir, lock_file); the profile is held until
+        lock_file is closed. (None, None) if every profile is taken or
+        file locking is unavailable, meaning a temporary profile is used.
+    """
+    if fcntl is None:
+        return None, None
     
-    for pattern in price_patterns:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    for profile_id in range(MAX_PROFILES):
+        lock_file = open(PROFILE_DIR / f"worker-{profile_id}.lock", "w")
         try:
-            price_elements = driver.find_elements(By.CSS_SELECTOR, pattern)
-            if price_elements:
-                for element in price_elements:
-                    price_text = element.text.strip()
-                    if price_text:
-                        prices.append(price_text)
-                break
-        except:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
             continue
+        return PROFILE_DIR / f"worker-{profile_id}", lock_file
+    return None, None
+
+
+def get_driver():
+    """
+    Return the current thread's WebDriver, starting one on first use.
     
-    #Find all elements containing "£" symbol
-    if not prices:
-        try:
-            all_text = driver.find_elements(By.XPATH, "//*[contains(text(), '£')]")
-            for element in all_text:
-                text = element.text.strip()
-                if text and "£" in text:
-                    prices.append(text)
-        except Exception as e:
-            print(f"Please try again later. Error: {e}")
+    Returns:
+        Configured WebDriver instance
+    """
+    driver = getattr(_thread_local, "driver", None)
+    with _drivers_lock:
+        # Drivers closed by quit_drivers() are dropped from _drivers
+        if driver in _drivers:
+            return driver
     
-    print(f"Extracted {len(prices)} product prices")
+    # Reuse the lowest free profile, so restarted browsers find a
+    # warm cache without clashing with browsers already running
+    profile_dir, lock_file = lock_profile()
+    try:
+        driver = setup_driver(headless=True, profile_dir=profile_dir)
+    except BaseException:
+        if lock_file:
+            lock_file.close()
+        raise
+    _thread_local.driver = driver
+    with _drivers_lock:
+        _drivers.append(driver)
+        if lock_file:
+            _profile_locks[driver] = lock_file
+    return driver
+
+
+def close_driver(driver):
+    """
+    Quit a browser and release its profile lock.
     
-    return prices
+    Args:
+        driver: WebDriver instance returned by get_driver()
+    """
+    try:
+        driver.quit()
+    except BROWSER_ERRORS:
+        pass
+    with _drivers_lock:
+        lock_file = _profile_locks.pop(driver, None)
+    if lock_file:
+        lock_file.close()
+
+
+def quit_drivers():
+    """
+    Close every browser started by get_driver().
+    """
+    with _drivers_lock:
+        drivers = list(_drivers)
+        _drivers.clear()
+    for driver in drivers:
+        close_driver(driver)
 
 
-#Clean price string and convert to float
-def clean_price(price_string):
+def discard_driver(driver):
     """
-    Clean price string and convert to float.
+    Close a browser that crashed or lost its connection, so the next
+    get_driver() call in its thread starts a fresh one.
     
-    Examples:
-        "£12.50" -> 12.50
-        "£ 15.99" -> 15.99
-        "Price: £20" -> 20.0
+    Args:
+        driver: WebDriver instance returned by get_driver()
+    """
+    with _drivers_lock:
+        if driver in _drivers:
+            _drivers.remove(driver)
+    close_driver(driver)
+
+
+atexit.register(quit_drivers)
+
+
+def scrape_pages(urls):
+    """
+    Scrape several Vinted search pages in parallel, one browser per
+    worker thread.
     
     Args:
-        price_string: Raw price string from webpage
+        urls: Vinted search URLs (e.g. one per results page)
     
     Returns:
-        Float value of price, or None if parsing fails
+        List of price values (floats) from all pages
     """
-    if not price_string:
-        return None
+    def scrape_one(url):
+        # Retry once with a new browser if the current one has died
+        for attempt in range(2):
+            driver = get_driver()
+            try:
+                return scrape_vinted_prices(driver, url)
+            except BROWSER_ERRORS as e:
+                discard_driver(driver)
+                error = e
+        print(f"Could not load {url}. Please try again later. Error: {error}")
+        return []
     
-    # Remove £ symbol and any whitespace
-    cleaned = price_string.replace("£", "").strip()
+    print(f"Loading {len(urls)} result pages in the browser...")
+    prices = []
+    for page_prices in _browser_pool.map(scrape_one, urls):
+        prices.extend(page_prices)
     
-    # Extract first number (in case there are multiple prices or text)
-    # Standard price format
-    match = re.search(r'(\d+\.?\d*)', cleaned)
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            return None
+    print(f"Extracted {len(prices)} product prices")
     
-    return None
-
+    return prices
 
 
 def calculate_average_price(prices):
     """
-    Calculate average price from list of prices.
+    Calculate the trimmed average price from list of prices.
+    The cheapest and most expensive 10% of listings are ignored so a
+    few mispriced or designer listings don't skew the suggestion.
+    With fewer than 10 prices nothing is trimmed.
     
     Args:
-        prices: List of float prices
+        prices: List or NumPy array of float prices
     
     Returns:
         Average price as float, or None if list is empty
     """
-    if not prices:
+    prices = np.asarray(prices, dtype=float)
+    if not prices.size:
         return None
     
-    return sum(prices) / len(prices)
+    # Slice by position so the trim never removes every price
+    cut = int(prices.size * 0.1)
+    trimmed = np.sort(prices)[cut:prices.size - cut]
+    return float(trimmed.mean())
 
 
-def main():
+def calculate_median_price(prices):
     """
-    Main function to orchestrate the scraping process.
+    Calculate median price from list of prices.
+    
+    Args:
+        prices: List or NumPy array of float prices
+    
+    Returns:
+        Median price as float, or None if list is empty
     """
-    # Get user input
-    brand, description, condition = get_user_input()
+    prices = np.asarray(prices, dtype=float)
+    if not prices.size:
+        return None
     
-    # Construct search URL
-    url = construct_search_url(brand, description, condition)
+    return float(np.median(prices))
+
+
+def search_prices(brand, description, condition):
+    """
+    Fetch prices for one product and print the resale price suggestion.
     
-    # Setup driver
-    driver = None
-    try:
-        driver = setup_driver(headless=True)
-        
-        # Scrape prices
-        price_strings = scrape_vinted_prices(driver, url)
-        
-        if not price_strings:
-            print("\n⚠️  No prices found on the page.")
-            print("  - No results matched your search")
-            print("Please check your spelling and try again.")
-            return
-        
-        # Clean prices
-        cleaned_prices = []
-        for price_str in price_strings:
-            price_float = clean_price(price_str)
-            if price_float is not None:
-                cleaned_prices.append(price_float)
-        
-        if not cleaned_prices:
-            print("\n⚠️  Could not retrieve any prices from the page.")
-            return
-        
-        # Use cleaned prices directly since filtering was removed
-        filtered_prices = cleaned_prices
+    Args:
+        brand: Product brand
+        description: Product description
+        condition: Condition label from the menu
+    """
+    # Construct search terms and URLs
+    search_terms = construct_search_terms(brand, description, condition)
+    urls = [construct_search_url(brand, description, condition, page) for page in range(1, SEARCH_PAGES + 1)]
+    
+    # Reuse the prices of an identical search from the last hour
+    cache_key = construct_cache_key(brand, description, condition)
+    cleaned_prices = load_cached_prices(cache_key)
+    print("\nCalculating a price for your product...")
+    
+    if cleaned_prices is not None:
+        print("Using prices saved from a recent identical search...")
+    else:
+        # Fetch prices from the API
+        cleaned_prices = fetch_api_prices(search_terms)
         
-        # Calculate average
-        avg_price = calculate_average_price(filtered_prices)
+        if cleaned_prices is None:
+            print("API access refused, falling back to the browser...")
+            
+            # Scrape prices (browsers are only started on this path)
+            cleaned_prices = scrape_pages(urls)
         
-        # Display results
+        if len(cleaned_prices):
+            save_cached_prices(cache_key, cleaned_prices)
+    
+    if not len(cleaned_prices):
+        print("\n⚠️  No prices found on the page.")
+        print("  - No results matched your search")
+        print("Please check your spelling and try again.")
+        return
+    
+    # Use cleaned prices directly since filtering was removed
+    filtered_prices = cleaned_prices
+    
+    # Calculate average and median
+    avg_price = calculate_average_price(filtered_prices)
+    median_price = calculate_median_price(filtered_prices)
+    
+    # Display results
+    print("\n" + "=" * 60)
+    print("RESULTS")
+    print("=" * 60)
+    print(f"Search terms: {brand} {description}")
+    print(f"Condition filter: {condition}")
+    
+    if avg_price is not None:
+        print(f"Average price: £{avg_price:.2f} (excluding the top and bottom 10%)")
+        print(f"Median price: £{median_price:.2f}")
         print("\n" + "=" * 60)
-        print("RESULTS")
+        print(f"RESALE PRICE SUGGESTION: £{avg_price:.2f}")
         print("=" * 60)
-        print(f"Search terms: {brand} {description}")
-        print(f"Condition filter: {condition}")
-        
-        if avg_price is not None:
-            print(f"Average price: £{avg_price:.2f}")
-            print("\n" + "=" * 60)
-            print(f"RESALE PRICE SUGGESTION: £{avg_price:.2f}")
-            print("=" * 60)
-        else:
-            print("Could not calculate average price.")
-        
-    except Exception as e:
-        print(f"\n❌ Error occurred: {e}")
-        import traceback
-        traceback.print_exc()
+    else:
+        print("Could not calculate average price.")
+
+
+def main():
+    """
+    Main function to orchestrate the scraping process.
+    Keeps prompting for products until the user quits, so any browsers
+    started for the fallback are reused between searches.
+    """
+    try:
+        while True:
+            # Get user input
+            query = get_user_input()
+            if query is None:
+                break
+            
+            try:
+                search_prices(*query)
+            except Exception as e:
+                print(f"\n❌ Error occurred: {e}")
+                import traceback
+                traceback.print_exc()
+            print()
     
     finally:
-        # Close the browser and thank the user
-        if driver:
-            print("\nThanks for using Vinted UK Price Scraper!") 
-            print("See you next time!")
-            driver.quit()
+        # Close the browsers and thank the user
+        print("\nThanks for using Vinted UK Price Scraper!") 
+        print("See you next time!")
+        quit_drivers()
 
 
 if __name__ == "__main__":